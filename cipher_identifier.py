@@ -0,0 +1,376 @@
+import math
+import operator
+import re
+import sys
+from multiprocessing import Pool
+
+from caesar_cipher import caesar_decrypt
+from vigenere_cipher import vigenere_decrypt
+from rail_fence_cipher import rail_fence_decrypt
+from columnar_cipher import columnar_decrypt
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Relative letter frequencies of English text (A-Z)
+ENGLISH_FREQUENCIES = [
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015,
+    0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749,
+    0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758,
+    0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+]
+
+# Percent frequencies of the 50 most common English bigrams; every other pair gets
+# BIGRAM_FLOOR when scoring candidate decryptions
+BIGRAM_FREQUENCIES = {
+    "TH": 3.56, "HE": 3.07, "IN": 2.43, "ER": 2.05, "AN": 1.99, "RE": 1.85, "ON": 1.76,
+    "AT": 1.49, "EN": 1.45, "ND": 1.35, "TI": 1.34, "ES": 1.34, "OR": 1.28, "TE": 1.20,
+    "OF": 1.17, "ED": 1.17, "IS": 1.13, "IT": 1.12, "AL": 1.09, "AR": 1.07, "ST": 1.05,
+    "TO": 1.04, "NT": 1.04, "NG": 0.95, "SE": 0.93, "HA": 0.93, "AS": 0.87, "OU": 0.87,
+    "IO": 0.83, "LE": 0.83, "VE": 0.83, "CO": 0.79, "ME": 0.79, "DE": 0.76, "HI": 0.76,
+    "RI": 0.73, "RO": 0.73, "IC": 0.70, "NE": 0.69, "EA": 0.69, "RA": 0.69, "CE": 0.65,
+    "LI": 0.62, "CH": 0.60, "LL": 0.58, "BE": 0.58, "MA": 0.57, "SI": 0.55, "OM": 0.55,
+    "UR": 0.54,
+}
+BIGRAM_FLOOR = 0.05
+
+CIPHERS = ("caesar", "vigenere", "rail_fence", "columnar")
+
+# Classification thresholds. Sample statistics are noisier for short texts, so the
+# IoC threshold is lowered by IOC_TOLERANCE / sqrt(letters) and the chi-squared
+# limit for an English fit grows with the number of letters
+MIN_LETTERS = 12
+MONOALPHABETIC_IOC = 0.055
+IOC_TOLERANCE = 0.05
+ENGLISH_FIT_BASE = 35
+ENGLISH_FIT_PER_LETTER = 0.5
+CAESAR_CONTRAST = 0.09
+VIGENERE_CONTRAST = 0.14
+MAX_PERIOD = 12
+MAX_RAILS = 12
+MAX_COLUMNS = 7
+
+_NON_LETTERS = re.compile(r"[^A-Z]+")
+_INVERSE_FREQUENCIES = [1 / freq for freq in ENGLISH_FREQUENCIES]
+_BIGRAM_LOGS = {
+    a + b: math.log10(BIGRAM_FREQUENCIES.get(a + b, BIGRAM_FLOOR) / 100)
+    for a in ALPHABET
+    for b in ALPHABET
+}
+_WORST_BIGRAM_LOG = min(_BIGRAM_LOGS.values())
+
+def letters_only(text):
+
+    # Return the uppercase A-Z letters of text with everything else removed
+    return _NON_LETTERS.sub("", text.upper())
+
+def letter_counts(letters):
+
+    # Count occurrences of each letter A-Z in an uppercase letter string
+    return [letters.count(char) for char in ALPHABET]
+
+def index_of_coincidence(counts):
+
+    # Index of coincidence for a list of letter counts
+    total = sum(counts)
+    if total < 2:
+        return 0.0
+    return sum(n * (n - 1) for n in counts) / (total * (total - 1))
+
+def chi_squared_by_shift(counts, skip=None):
+
+    # Chi-squared distance to English for every Caesar shift of the counts.
+    # A skip letter (such as columnar 'X' padding) is left out of the fit.
+    total = sum(counts)
+    if skip is not None:
+        total -= counts[skip]
+    if total <= 0:
+        return [0.0] * 26
+
+    # sum((o - e)^2 / e) expands to sum(o^2 / e) - total since both sum to total
+    squares = [n * n for n in counts]
+    scores = []
+    for shift in range(26):
+        # Undoing a shift of `shift` maps ciphertext letter i + shift to i
+        rotated = squares[shift:] + squares[:shift]
+        weighted = sum(map(operator.mul, rotated, _INVERSE_FREQUENCIES))
+        mass = 1.0
+        if skip is not None:
+            # Drop the skipped letter and rescale the rest of the English frequencies
+            skipped = (skip - shift) % 26
+            weighted -= squares[skip] * _INVERSE_FREQUENCIES[skipped]
+            mass -= ENGLISH_FREQUENCIES[skipped]
+        scores.append(weighted * mass / total - total)
+    return scores
+
+def ioc_threshold(length):
+
+    # Index of coincidence above which a text of this many letters looks monoalphabetic
+    return MONOALPHABETIC_IOC - IOC_TOLERANCE / max(length, 1) ** 0.5
+
+def english_fit_limit(length):
+
+    # Largest chi-squared distance that still counts as English letter frequencies
+    return ENGLISH_FIT_BASE + ENGLISH_FIT_PER_LETTER * length
+
+def coincidences(letters, max_lag):
+
+    # Count positions where the text matches itself shifted by 1..max_lag letters
+    return [sum(map(operator.eq, letters, letters[lag:])) for lag in range(1, max_lag + 1)]
+
+def periodic_ioc(letters, max_period=MAX_PERIOD, counts=None):
+
+    # Coincidence rate between letters a multiple of each period 1..max_period apart.
+    # Period 1 is the plain IoC; longer periods pool lags p, 2p and 3p because
+    # neighbouring letters in English coincide less often than the IoC suggests
+    size = len(letters)
+    if counts is None:
+        counts = letter_counts(letters)
+    matches = coincidences(letters, min(3 * max_period, size - 1))
+    rates = []
+    for period in range(1, max_period + 1):
+        if size < period * 2:
+            break
+        if period == 1:
+            rates.append(index_of_coincidence(counts))
+            continue
+        lags = [lag for lag in (period, 2 * period, 3 * period) if lag < size]
+        pairs = sum(size - lag for lag in lags)
+        rates.append(sum(matches[lag - 1] for lag in lags) / pairs)
+    return rates
+
+def bigram_log_score(letters):
+
+    # Average log10 probability of the letter pairs under English bigram frequencies;
+    # pairs with anything but uppercase letters score as the rarest pair
+    if len(letters) < 2:
+        return _WORST_BIGRAM_LOG
+    logs = _BIGRAM_LOGS
+    total = sum(logs.get(a + b, _WORST_BIGRAM_LOG) for a, b in zip(letters, letters[1:]))
+    return total / (len(letters) - 1)
+
+def extract_features(text, max_period=MAX_PERIOD):
+
+    # Compute the statistical features used to identify the cipher
+    letters = letters_only(text)
+    counts = letter_counts(letters)
+    has_spaces = " " in text
+    has_lowercase = text.upper() != text
+
+    # Columnar output has no spaces or lowercase and may end columns with 'X' padding,
+    # which would otherwise pull the frequency fit away from English
+    skip = None if has_spaces or has_lowercase else ALPHABET.index("X")
+    chi_scores = chi_squared_by_shift(counts, skip)
+    best_shift = min(range(26), key=chi_scores.__getitem__)
+    period_iocs = periodic_ioc(letters, max_period, counts)
+
+    # Best period is the smallest one whose columns look monoalphabetic
+    best_period = 1
+    for period, ioc in enumerate(period_iocs, start=1):
+        if ioc >= ioc_threshold(len(letters) // period):
+            best_period = period
+            break
+    else:
+        if period_iocs:
+            best_period = max(range(len(period_iocs)), key=period_iocs.__getitem__) + 1
+
+    return {
+        "length": len(letters),
+        "ioc": index_of_coincidence(counts),
+        "chi_squared": chi_scores[0],
+        "best_shift": best_shift,
+        "best_shift_chi_squared": chi_scores[best_shift],
+        "shift_contrast": chi_scores[best_shift] / max(sorted(chi_scores)[13], 1e-9),
+        "periodic_ioc": period_iocs,
+        "best_period": best_period,
+        "has_spaces": has_spaces,
+        "has_lowercase": has_lowercase,
+    }
+
+def crack_caesar(ciphertext, features=None):
+
+    # Recover the Caesar shift by matching letter frequencies to English
+    if features is None:
+        features = extract_features(ciphertext)
+    shift = features["best_shift"]
+    return shift, caesar_decrypt(ciphertext, shift)
+
+def crack_vigenere(ciphertext, features=None):
+
+    # Recover a Vigenère key from the periodic IoC peak and per-column frequencies
+    if features is None:
+        features = extract_features(ciphertext)
+    letters = letters_only(ciphertext)
+
+    # Short texts give noisy peaks, so check the runner-up periods too
+    periods = range(1, len(features["periodic_ioc"]) + 1)
+    candidates = sorted(periods, key=lambda p: -features["periodic_ioc"][p - 1])[:4]
+    if features["best_period"] not in candidates:
+        candidates.append(features["best_period"])
+
+    best_key, best_plaintext, best_score = "A", ciphertext, -math.inf
+    for period in sorted(candidates):
+        key = ""
+        for start in range(period):
+            chi_scores = chi_squared_by_shift(letter_counts(letters[start::period]))
+            key += ALPHABET[min(range(26), key=chi_scores.__getitem__)]
+        plaintext = vigenere_decrypt(ciphertext, key)
+        score = bigram_log_score(letters_only(plaintext))
+        if score > best_score:
+            best_key, best_plaintext, best_score = key, plaintext, score
+    return best_key, best_plaintext
+
+def crack_rail_fence(ciphertext, max_rails=MAX_RAILS):
+
+    # Try every rail count and keep the decryption with the best digram score
+    best_rails, best_plaintext, best_score = 1, ciphertext, -math.inf
+    for num_rails in range(2, min(max_rails, len(ciphertext)) + 1):
+        plaintext = rail_fence_decrypt(ciphertext, num_rails)
+        score = bigram_log_score(letters_only(plaintext))
+        if score > best_score:
+            best_rails, best_plaintext, best_score = num_rails, plaintext, score
+    return best_rails, best_plaintext
+
+def _best_column_permutation(chunks, pair_scores):
+
+    # Search column arrangements using precomputed adjacency scores
+    num_columns = len(chunks)
+    best_order, best_score = list(range(num_columns)), -math.inf
+
+    # Depth-first search over arrangements, each step adding one column
+    stack = [([column], 0.0) for column in range(num_columns)]
+    while stack:
+        order, score = stack.pop()
+        if len(order) == num_columns:
+            if score > best_score:
+                best_order, best_score = order, score
+            continue
+        last = order[-1]
+        for column in range(num_columns):
+            if column not in order:
+                stack.append((order + [column], score + pair_scores[last][column]))
+    return best_order, best_score
+
+def crack_columnar(ciphertext, max_columns=MAX_COLUMNS):
+
+    # Recover a columnar key by scoring digrams across adjacent columns
+    best_key, best_plaintext, best_score = "", ciphertext, -math.inf
+
+    for num_columns in range(2, max_columns + 1):
+        if len(ciphertext) % num_columns != 0:
+            continue
+        num_rows = len(ciphertext) // num_columns
+        # chunks[i] holds the column that was read out i-th
+        chunks = [ciphertext[i * num_rows:(i + 1) * num_rows] for i in range(num_columns)]
+
+        logs = _BIGRAM_LOGS
+        pair_scores = [[0.0] * num_columns for _ in range(num_columns)]
+        for a in range(num_columns):
+            for b in range(num_columns):
+                if a != b:
+                    pair_scores[a][b] = sum(logs.get(x + y, _WORST_BIGRAM_LOG) for x, y in zip(chunks[a], chunks[b]))
+
+        order, _ = _best_column_permutation(chunks, pair_scores)
+
+        # Grid column c holds chunk order[c], which get_column_order
+        # reproduces when the key letter at c ranks order[c]-th
+        key = "".join(ALPHABET[i] for i in order)
+        plaintext = columnar_decrypt(ciphertext, key)
+
+        # Compare widths on the whole decryption, whose length does not depend on the width
+        score = bigram_log_score(letters_only(plaintext))
+        if score > best_score:
+            best_key, best_plaintext, best_score = key, plaintext, score
+    return best_key, best_plaintext
+
+def _identify(text, features):
+
+    # Returns the cipher and, when cracking was needed to decide, its (key, plaintext)
+    length = features["length"]
+    if length < MIN_LETTERS:
+        return "unknown", None
+
+    # Transpositions keep English letter frequencies in place, whatever the IoC
+    fit_limit = english_fit_limit(length)
+    if features["chi_squared"] <= fit_limit:
+        # Columnar output drops spaces and is uppercased, rail fence keeps both
+        if features["has_spaces"] or features["has_lowercase"]:
+            return "rail_fence", None
+
+        # Ambiguous layout: keep whichever transposition decrypts to better digrams
+        rail_crack = crack_rail_fence(text)
+        columnar_crack = crack_columnar(text)
+        if bigram_log_score(letters_only(columnar_crack[1])) > bigram_log_score(letters_only(rail_crack[1])):
+            return "columnar", columnar_crack
+        return "rail_fence", rail_crack
+
+    # Substitutions move the frequency peaks. A Caesar shift has one shift that fits
+    # far better than the rest; a Vigenère key spreads the fit over several shifts
+    contrast = features["shift_contrast"]
+    if contrast <= CAESAR_CONTRAST:
+        return "caesar", None
+    if contrast <= VIGENERE_CONTRAST and features["ioc"] >= ioc_threshold(length):
+        return "caesar", None
+    return "vigenere", None
+
+def classify(text, features=None):
+
+    # Identify which of the four ciphers most likely produced text
+    if features is None:
+        features = extract_features(text)
+    return _identify(text, features)[0]
+
+def crack(text, cipher, features=None):
+
+    # Route text to the cracker for the given cipher and return (key, plaintext)
+    if cipher == "caesar":
+        return crack_caesar(text, features)
+    if cipher == "vigenere":
+        return crack_vigenere(text, features)
+    if cipher == "rail_fence":
+        return crack_rail_fence(text)
+    if cipher == "columnar":
+        return crack_columnar(text)
+    return None, text
+
+def triage(text):
+
+    # Classify a single ciphertext and run the matching cracker
+    features = extract_features(text)
+    cipher, cracked = _identify(text, features)
+    if cracked is None:
+        cracked = crack(text, cipher, features)
+    key, plaintext = cracked
+    return {"cipher": cipher, "key": key, "plaintext": plaintext}
+
+def triage_batch(texts, workers=None, chunksize=256):
+
+    # Triage many ciphertexts, spreading the work over worker processes
+    if workers == 1:
+        return [triage(text) for text in texts]
+    with Pool(workers) as pool:
+        return pool.map(triage, texts, chunksize)
+
+def main():
+
+    print("CIPHER IDENTIFIER ")
+
+    if len(sys.argv) > 1:
+        # Triage one ciphertext per line from the given file
+        with open(sys.argv[1], encoding="utf-8") as handle:
+            texts = [line.rstrip("\n") for line in handle if line.strip()]
+        for text, result in zip(texts, triage_batch(texts)):
+            print(f"{result['cipher']:<10} {result['key']!s:<10} {text[:40]} -> {result['plaintext'][:40]}")
+        return
+
+    while True:
+        ciphertext = input("\nEnter ciphertext to identify (blank to exit): ")
+        if not ciphertext:
+            print("Exiting Cipher Identifier program...")
+            break
+        result = triage(ciphertext)
+        print(f"\nCipher:     {result['cipher']}")
+        print(f"Key:        {result['key']}")
+        print(f"Plaintext:  {result['plaintext']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from itertools import chain, islice
+
 def get_column_order(key):
 
     # Create pairs of (character, original_index)
@@ -77,44 +79,154 @@ def columnar_decrypt(ciphertext, key):
     # Remove trailing 'X' padding
     return plaintext.rstrip('X')
 
-def visualize_grid(text, key, operation="encrypt"):
+def iter_grid_lines(text, key, operation="encrypt", start=0, stop=None):
   
     if not key:
-        return text
+        yield text
+        return
     
     key_length = len(key)
+    column_order = get_column_order(key)
+    
+    # Header
+    yield "Key:     " + " ".join(key.upper())
+    yield "Order:   " + " ".join([str(i+1) for i in column_order])
+    yield "-" * (key_length * 2 + 7)
     
     if operation == "encrypt":
-        # For encryption visualization
-        processed_text = text.replace(' ', '').upper()
-        num_rows = len(processed_text) // key_length
-        if len(processed_text) % key_length != 0:
-            num_rows += 1
-            processed_text += 'X' * (num_rows * key_length - len(processed_text))
-        
-        # Create and fill grid
-        grid = []
-        for i in range(num_rows):
-            row = []
-            for j in range(key_length):
-                char_index = i * key_length + j
-                if char_index < len(processed_text):
-                    row.append(processed_text[char_index])
-                else:
-                    row.append('X')
-            grid.append(row)
+        # Stream the processed text row by row without building the padded grid;
+        # uppercasing can expand a character ('ß' -> 'SS'), so flatten the results
+        chars = chain.from_iterable(char.upper() for char in text if char != ' ')
+        row_index = 0
+        while stop is None or row_index < stop:
+            row = ''.join(islice(chars, key_length))
+            if not row:
+                break
+            if row_index >= start:
+                yield "         " + " ".join(row.ljust(key_length, 'X'))
+            row_index += 1
     
-    # Create visualization
-    column_order = get_column_order(key)
-    visualization = "Key:     " + " ".join(key.upper()) + "\n"
-    visualization += "Order:   " + " ".join([str(i+1) for i in column_order]) + "\n"
-    visualization += "-" * (key_length * 2 + 7) + "\n"
+    elif operation == "decrypt":
+        # Grid column j was read out rank[j]-th, so its letters are one ciphertext block
+        num_rows = len(text) // key_length
+        rank = [0] * key_length
+        for i, col_index in enumerate(column_order):
+            rank[col_index] = i
+        
+        if stop is None or stop > num_rows:
+            stop = num_rows
+        for row_index in range(start, stop):
+            row = [text[rank[j] * num_rows + row_index] for j in range(key_length)]
+            yield "         " + " ".join(row)
+
+def write_grid(file, text, key, operation="encrypt", start=0, stop=None):
     
-    if operation == "encrypt":
-        for row in grid:
-            visualization += "         " + " ".join(row) + "\n"
+    # Write the grid to a file object one line at a time
+    for line in iter_grid_lines(text, key, operation, start, stop):
+        file.write(line + "\n")
+
+def visualize_grid(text, key, operation="encrypt"):
+  
+    if not key:
+        return text
     
-    return visualization
+    # Create visualization
+    return "".join(line + "\n" for line in iter_grid_lines(text, key, operation))
+
+def key_from_order(column_order):
+
+    if len(column_order) > 26:
+        raise ValueError("Column orders longer than 26 cannot be written as a letter key")
+
+    # The column read i-th gets the i-th letter, so get_column_order gives it back
+    key = [''] * len(column_order)
+    for rank, col_index in enumerate(column_order):
+        key[col_index] = chr(65 + rank)
+    return ''.join(key)
+
+def recover_key(plaintext, ciphertext):
+
+    processed_text = plaintext.replace(' ', '').upper()
+
+    # Try key lengths from the shortest; the padded grid must match the ciphertext size
+    for key_length in range(1, len(ciphertext) + 1):
+        num_rows = -(-len(processed_text) // key_length)
+        if num_rows * key_length != len(ciphertext):
+            continue
+        padded_text = processed_text + 'X' * (len(ciphertext) - len(processed_text))
+
+        # Index grid columns by their contents; equal columns are interchangeable
+        columns = {}
+        for col_index in range(key_length):
+            columns.setdefault(padded_text[col_index::key_length], []).append(col_index)
+
+        column_order = []
+        for i in range(key_length):
+            chunk = ciphertext[i * num_rows:(i + 1) * num_rows]
+            if not columns.get(chunk):
+                break
+            column_order.append(columns[chunk].pop(0))
+        else:
+            return key_from_order(column_order)
+
+    raise ValueError("Ciphertext is not a columnar encryption of the plaintext")
+
+def _has_assignment(candidates):
+
+    # Bipartite matching: every constrained grid column needs its own ciphertext chunk
+    assigned = {}
+
+    def assign(col_index, seen):
+        for chunk_index in candidates[col_index]:
+            if chunk_index in seen:
+                continue
+            seen.add(chunk_index)
+            if chunk_index not in assigned or assign(assigned[chunk_index], seen):
+                assigned[chunk_index] = col_index
+                return True
+        return False
+
+    return all(assign(col_index, set()) for col_index in candidates)
+
+def crib_search(crib, ciphertext, max_key_length=10):
+
+    crib = crib.replace(' ', '').upper()
+    results = []
+
+    for key_length in range(2, max_key_length + 1):
+        if len(ciphertext) % key_length != 0 or len(crib) < key_length:
+            continue
+        num_rows = len(ciphertext) // key_length
+        chunks = [ciphertext[i * num_rows:(i + 1) * num_rows] for i in range(key_length)]
+
+        # Crib letters start..start+k*m all land in one grid column on consecutive rows,
+        # so find every row where each piece occurs in each chunk once up front
+        piece_rows = []
+        for start in range(key_length):
+            piece = crib[start::key_length]
+            rows = {}
+            for chunk_index, chunk in enumerate(chunks):
+                row = chunk.find(piece)
+                while row != -1:
+                    rows.setdefault(row, []).append(chunk_index)
+                    row = chunk.find(piece, row + 1)
+            piece_rows.append(rows)
+
+        # Sliding the crib along only changes which row each piece must start on
+        for offset in range(len(ciphertext) - len(crib) + 1):
+            candidates = {}
+            for start in range(key_length):
+                row, col_index = divmod(offset + start, key_length)
+                chunk_indices = piece_rows[start].get(row)
+                if not chunk_indices:
+                    break
+                candidates[col_index] = chunk_indices
+            else:
+                if _has_assignment(candidates):
+                    # Offsets count letters of the plaintext with spaces removed
+                    results.append((offset, key_length, dict(sorted(candidates.items()))))
+
+    return results
 
 def main():
    
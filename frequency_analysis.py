@@ -0,0 +1,253 @@
+import mmap
+import operator
+import struct
+import sys
+from array import array
+from collections import Counter
+from itertools import repeat
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Byte translation that maps A-Z and a-z to 0-25 and drops everything else
+_ENCODE_TABLE = bytearray(256)
+for _i in range(26):
+    _ENCODE_TABLE[65 + _i] = _i
+    _ENCODE_TABLE[97 + _i] = _i
+_ENCODE_TABLE = bytes(_ENCODE_TABLE)
+_NON_LETTER_BYTES = bytes(b for b in range(256) if not (65 <= b <= 90 or 97 <= b <= 122))
+
+# Binary table layout: magic, n-gram order, total count, then 26**n counts,
+# all little-endian whatever the byte order of the host
+_MAGIC = b"NGRM"
+_HEADER = struct.Struct("<4sIQ")
+_TYPECODE = "Q"
+
+# Letter pairs packed into one native 16-bit value, and the combined index of each,
+# so that memoryview casts can count several letters per item
+_PAIRS = bytes(value for a in range(26) for b in range(26) for value in (a, b))
+_PAIR_INDEX = dict(zip(memoryview(_PAIRS).cast("H"), range(676)))
+
+def encode(text):
+
+    # Integer-encode the letters of text (str or bytes) as a bytes string of 0-25
+    if isinstance(text, str):
+        text = text.encode("ascii", "ignore")
+    return bytes(text).translate(_ENCODE_TABLE, _NON_LETTER_BYTES)
+
+def decode(encoded):
+
+    # Turn integer-encoded letters back into an uppercase string
+    return "".join(ALPHABET[value] for value in encoded)
+
+def combined_index(encoded):
+
+    # Combined base-26 index of a sequence of encoded letters
+    index = 0
+    for value in encoded:
+        index = index * 26 + value
+    return index
+
+def ngram_index(ngram):
+
+    # Combined index of an n-gram string such as "TH" or "TION"
+    return combined_index(encode(ngram))
+
+def ngram_from_index(index, n):
+
+    # N-gram string for a combined index
+    chars = []
+    for _ in range(n):
+        index, value = divmod(index, 26)
+        chars.append(ALPHABET[value])
+    return "".join(reversed(chars))
+
+# Counts of every n-gram of letters, updated as text streams in
+class NgramCounter:
+
+    def __init__(self, n, counts=None, total=0):
+        if not 1 <= n <= 4:
+            raise ValueError("N-gram order must be between 1 and 4")
+        self.n = n
+        self.counts = counts if counts is not None else array(_TYPECODE, bytes(8 * 26 ** n))
+        self.total = total
+        # First and last n-1 letters seen, used to join n-grams across chunks
+        self.head = b""
+        self.tail = b""
+
+    def update(self, chunk):
+
+        # Add the n-grams of the next chunk of a stream of text
+        self.update_encoded(encode(chunk))
+
+    def update_encoded(self, encoded):
+
+        # Add the n-grams of the next chunk of already encoded letters
+        if not encoded:
+            return
+        keep = self.n - 1
+
+        if len(self.head) < keep:
+            self.head = (self.head + encoded)[:keep]
+        # N-grams that start in the previous chunk end in this one
+        self._add(self.tail + encoded)
+        self.tail = (self.tail + encoded)[-keep:] if keep else b""
+
+    def _add(self, encoded):
+        counts = self.counts
+        n = self.n
+
+        if n == 1:
+            for value in range(26):
+                counts[value] += encoded.count(value)
+        else:
+            # Count 2 or 4 letters per item: items starting at every offset cover all
+            # positions. Trigrams are counted as 4 letters after one byte of padding
+            width, typecode = (2, "H") if n == 2 else (4, "I")
+            view = memoryview(encoded + bytes(width - n))
+            packed = Counter()
+            for offset in range(width):
+                size = (len(view) - offset) // width * width
+                packed.update(view[offset:offset + size].cast(typecode))
+
+            if n == 2:
+                indices = map(_PAIR_INDEX.__getitem__, packed)
+            else:
+                # Split each item back into its first and second letter pairs
+                halves = memoryview(array(typecode, packed).tobytes()).cast("H")
+                firsts = map(_PAIR_INDEX.__getitem__, halves[0::2])
+                seconds = map(_PAIR_INDEX.__getitem__, halves[1::2])
+                if n == 3:
+                    seconds = map(operator.floordiv, seconds, repeat(26))
+                indices = map(operator.add, map(operator.mul, firsts, repeat(26 ** (n - 2))), seconds)
+            for index, count in zip(indices, packed.values()):
+                counts[index] += count
+
+        self.total += max(len(encoded) - n + 1, 0)
+
+    def merge(self, other):
+
+        # Add the counts of a counter for the text that directly follows this one
+        if other.n != self.n:
+            raise ValueError("Cannot merge counters of different n-gram orders")
+        keep = self.n - 1
+
+        self.counts = array(_TYPECODE, map(operator.add, self.counts, other.counts))
+        self.total += other.total
+
+        # Count only the n-grams that start in our tail and end in the other head
+        boundary = self.tail + other.head
+        for start in range(len(self.tail)):
+            end = start + self.n
+            if len(self.tail) < end <= len(boundary):
+                self.counts[combined_index(boundary[start:end])] += 1
+                self.total += 1
+
+        if len(self.head) < keep:
+            self.head = (self.head + other.head)[:keep]
+        self.tail = (self.tail + other.tail)[-keep:] if keep else b""
+        return self
+
+    def __add__(self, other):
+        combined = NgramCounter(self.n, array(_TYPECODE, self.counts), self.total)
+        combined.head, combined.tail = self.head, self.tail
+        return combined.merge(other)
+
+    def __getitem__(self, ngram):
+        return self.counts[ngram_index(ngram)]
+
+    def most_common(self, count=10):
+
+        # Return the most frequent n-grams as (ngram, count) pairs
+        top = sorted(range(len(self.counts)), key=self.counts.__getitem__, reverse=True)[:count]
+        return [(ngram_from_index(index, self.n), self.counts[index]) for index in top if self.counts[index]]
+
+    def frequencies(self):
+
+        # Relative frequency of every n-gram, indexed by combined index
+        if self.total == 0:
+            return [0.0] * len(self.counts)
+        return [count / self.total for count in self.counts]
+
+    def save(self, path):
+
+        # Write the counts in the compact binary table format
+        with open(path, "wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, self.n, self.total))
+            _little_endian(self.counts).tofile(handle)
+
+    @classmethod
+    def load(cls, path):
+
+        # Read a binary table written by save into a counter that can be updated
+        with open(path, "rb") as handle:
+            n, total = _read_header(handle.read(_HEADER.size))
+            counts = array(_TYPECODE)
+            counts.fromfile(handle, 26 ** n)
+        return cls(n, _little_endian(counts), total)
+
+def _little_endian(counts):
+
+    # Tables are stored little-endian, so big-endian hosts swap a copy of the counts
+    if sys.byteorder != "little":
+        counts = array(_TYPECODE, counts)
+        counts.byteswap()
+    return counts
+
+def _read_header(header):
+    magic, n, total = _HEADER.unpack(header)
+    if magic != _MAGIC:
+        raise ValueError("Not an n-gram table file")
+    return n, total
+
+def map_counts(path):
+
+    # Memory-map a binary table and return (n, total, read-only counts)
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    n, total = _read_header(mapped[:_HEADER.size])
+    counts = memoryview(mapped)[_HEADER.size:].cast(_TYPECODE)
+    if len(counts) != 26 ** n:
+        raise ValueError("N-gram table file is truncated")
+    # The mapping is only used directly when the host byte order matches the file
+    return n, total, _little_endian(counts)
+
+def count_ngrams(text, orders=(1, 2, 3, 4)):
+
+    # Count n-grams of text for each order and return {n: NgramCounter}
+    counters = {n: NgramCounter(n) for n in orders}
+    encoded = encode(text)
+    for counter in counters.values():
+        counter.update_encoded(encoded)
+    return counters
+
+def count_file(path, orders=(1, 2, 3, 4), chunk_size=1 << 20):
+
+    # Stream a text file through n-gram counters chunk by chunk
+    counters = {n: NgramCounter(n) for n in orders}
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            encoded = encode(chunk)
+            for counter in counters.values():
+                counter.update_encoded(encoded)
+    return counters
+
+def main():
+
+    print("FREQUENCY ANALYSIS ")
+
+    if len(sys.argv) < 2:
+        print("Usage: python frequency_analysis.py <text file> [table prefix]")
+        return
+
+    counters = count_file(sys.argv[1])
+    for n, counter in counters.items():
+        top = ", ".join(f"{ngram} {count}" for ngram, count in counter.most_common(8))
+        print(f"{n}-grams ({counter.total} total): {top}")
+        if len(sys.argv) > 2:
+            counter.save(f"{sys.argv[2]}_{n}grams.bin")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import argparse
+import importlib
+import random
+import time
+from multiprocessing import Pool
+
+# Characters for random texts: both cases, digits, whitespace and punctuation,
+# plus a few non-ASCII letters that str.isalpha accepts
+ASCII_TEXT_CHARS = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "abcdefghijklmnopqrstuvwxyz"
+    "0123456789  \t\n.,;:!?'-"
+)
+TEXT_CHARS = ASCII_TEXT_CHARS + "éÉßñ"
+KEY_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+# Reference functions that every engine is compared against, as "module:function"
+REFERENCES = {
+    "caesar_encrypt": "caesar_cipher:caesar_encrypt",
+    "caesar_decrypt": "caesar_cipher:caesar_decrypt",
+    "vigenere_encrypt": "vigenere_cipher:vigenere_encrypt",
+    "vigenere_decrypt": "vigenere_cipher:vigenere_decrypt",
+    "rail_fence_encrypt": "rail_fence_cipher:rail_fence_encrypt",
+    "rail_fence_decrypt": "rail_fence_cipher:rail_fence_decrypt",
+    "columnar_encrypt": "columnar_cipher:columnar_encrypt",
+    "columnar_decrypt": "columnar_cipher:columnar_decrypt",
+}
+
+# Engines checked on every run as (reference, engine, text characters): decrypting the
+# reference encryption must give the text back. The substitution ciphers map non-ASCII
+# letters into ASCII, so those cannot round-trip and are left out of the texts.
+# Round trips are compared with the unchanged text, so they only report correctness.
+ENGINES = {
+    "caesar_roundtrip": ("identity", "fuzz_harness:caesar_roundtrip", ASCII_TEXT_CHARS),
+    "vigenere_roundtrip": ("identity", "fuzz_harness:vigenere_roundtrip", ASCII_TEXT_CHARS),
+    "rail_fence_roundtrip": ("identity", "fuzz_harness:rail_fence_roundtrip", TEXT_CHARS),
+    "vigenere_autokey_roundtrip": ("identity", "fuzz_harness:autokey_roundtrip", ASCII_TEXT_CHARS),
+    # Triage must cope with the punctuation and digits that columnar encryption keeps
+    "columnar_triage": ("identity", "fuzz_harness:columnar_triage", TEXT_CHARS),
+    # Streaming modes must match the repeating-key reference exactly
+    "vigenere_stream": (REFERENCES["vigenere_encrypt"], "fuzz_harness:vigenere_stream_encrypt", TEXT_CHARS),
+    "vigenere_running_key": (REFERENCES["vigenere_encrypt"], "fuzz_harness:running_key_encrypt", TEXT_CHARS),
+}
+
+def identity(text, key):
+
+    # Reference for round-trip engines
+    return text
+
+def caesar_roundtrip(text, shift):
+    from caesar_cipher import caesar_encrypt, caesar_decrypt
+    return caesar_decrypt(caesar_encrypt(text, shift), shift)
+
+def vigenere_roundtrip(text, key):
+    from vigenere_cipher import vigenere_encrypt, vigenere_decrypt
+    return vigenere_decrypt(vigenere_encrypt(text, key), key)
+
+def rail_fence_roundtrip(text, num_rails):
+    from rail_fence_cipher import rail_fence_encrypt, rail_fence_decrypt
+    return rail_fence_decrypt(rail_fence_encrypt(text, num_rails), num_rails)
+
+def autokey_roundtrip(text, key):
+    from vigenere_cipher import autokey_encrypt, autokey_decrypt
+    return autokey_decrypt(autokey_encrypt(text, key), key)
+
+def columnar_triage(text, key):
+    # Only exceptions count: the text comes back whatever triage recovers
+    from columnar_cipher import columnar_encrypt
+    from cipher_identifier import triage
+    triage(columnar_encrypt(text, key))
+    return text
+
+def vigenere_stream_encrypt(text, key):
+    # Uneven chunk sizes move the key phase across chunk boundaries
+    from vigenere_cipher import vigenere_encrypt_stream
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    return "".join(vigenere_encrypt_stream(chunks, key))
+
+def running_key_encrypt(text, key):
+    # A running key made of the repeated keyword is a repeating-key Vigenère
+    from vigenere_cipher import running_key_encrypt
+    return running_key_encrypt(text, key * (len(text) // len(key) + 1))
+
+def load_function(spec):
+
+    # Import a function given as "module:function"
+    if spec == "identity":
+        return identity
+    module_name, _, function_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def random_text(rng, max_length, chars=TEXT_CHARS):
+
+    # Random text, biased towards the short and empty inputs that hit edge cases
+    length = rng.choice((0, 1, 2, rng.randint(0, 8), rng.randint(0, max_length)))
+    return "".join(rng.choice(chars) for _ in range(length))
+
+def random_key(rng, text):
+
+    # Random alphabetic key, sometimes longer than the text or with repeated letters
+    length = rng.choice((1, 2, rng.randint(1, 8), len(text) + rng.randint(1, 5)))
+    if rng.random() < 0.25:
+        # Repeated key letters exercise the tie-breaking in get_column_order
+        return rng.choice(KEY_CHARS) * length
+    return "".join(rng.choice(KEY_CHARS) for _ in range(length))
+
+def random_case(rng, kind, max_length, chars=TEXT_CHARS):
+
+    # Arguments (text, key) for one call of the given kind of function
+    text = random_text(rng, max_length, chars)
+    if kind == "caesar":
+        return text, rng.choice((0, 1, 13, 25, 26, -1, rng.randint(-60, 60)))
+    if kind == "rail_fence":
+        return text, rng.choice((1, 2, 3, len(text), len(text) + 1, rng.randint(0, 12)))
+    return text, random_key(rng, text)
+
+def kind_of(name):
+
+    # Cipher a reference or engine name belongs to
+    for kind in ("caesar", "vigenere", "rail_fence", "columnar"):
+        if name.startswith(kind):
+            return kind
+    raise ValueError(f"Cannot tell which cipher {name} belongs to")
+
+def same_result(reference, engine, args):
+
+    # Call both functions and compare results, treating equal exceptions as a match
+    try:
+        expected = ("ok", reference(*args))
+    except Exception as e:
+        expected = ("error", type(e).__name__)
+    try:
+        actual = ("ok", engine(*args))
+    except Exception as e:
+        actual = ("error", type(e).__name__)
+    return expected == actual, expected, actual
+
+def _shrink_candidates(value):
+
+    # Smaller variants of one argument, most aggressive first
+    if isinstance(value, str):
+        size = len(value) // 2
+        while size >= 1:
+            for start in range(0, len(value), size):
+                yield value[:start] + value[start + size:]
+            size //= 2
+        # Replace characters with 'a' to simplify what is left
+        for i, char in enumerate(value):
+            if char != "a":
+                yield value[:i] + "a" + value[i + 1:]
+    elif isinstance(value, int):
+        for smaller in (0, 1, 2, value // 2, value - 1 if value > 0 else value + 1):
+            if abs(smaller) < abs(value):
+                yield smaller
+
+def minimize(reference, engine, args):
+
+    # Greedily shrink a failing input while the mismatch persists
+    args = list(args)
+    progress = True
+    while progress:
+        progress = False
+        for position in range(len(args)):
+            for candidate in _shrink_candidates(args[position]):
+                trial = args[:position] + [candidate] + args[position + 1:]
+                if not same_result(reference, engine, trial)[0]:
+                    args = trial
+                    progress = True
+                    break
+    return tuple(args)
+
+def run_batch(task):
+
+    # Worker: run one engine and its reference over a batch of random cases
+    engine_name, reference_spec, engine_spec, chars, seed, count, max_length, max_failures = task
+    reference = load_function(reference_spec)
+    engine = load_function(engine_spec)
+    kind = kind_of(engine_name)
+    rng = random.Random(seed)
+    cases = [random_case(rng, kind, max_length, chars) for _ in range(count)]
+    total_chars = sum(len(args[0]) for args in cases)
+
+    # Time each function on its own pass so neither pays for the other
+    timings = {}
+    results = {}
+    for label, function in (("reference", reference), ("engine", engine)):
+        outputs = []
+        started = time.perf_counter()
+        for args in cases:
+            try:
+                outputs.append(function(*args))
+            except Exception as e:
+                outputs.append(type(e))
+        timings[label] = time.perf_counter() - started
+        results[label] = outputs
+
+    failures = []
+    for args, expected, actual in zip(cases, results["reference"], results["engine"]):
+        if expected != actual and len(failures) < max_failures:
+            small_args = minimize(reference, engine, args)
+            _, small_expected, small_actual = same_result(reference, engine, small_args)
+            failures.append((small_args, small_expected, small_actual))
+
+    mismatches = sum(1 for expected, actual in zip(results["reference"], results["engine"]) if expected != actual)
+    return engine_name, count, total_chars, timings, mismatches, failures
+
+def fuzz(engines, iterations=100000, workers=None, batch_size=2000, max_length=200, seed=0, max_failures=3):
+
+    # Run every engine against its reference and return a summary per engine
+    tasks = []
+    for engine_name, (reference_spec, engine_spec, chars) in engines.items():
+        for batch, start in enumerate(range(0, iterations, batch_size)):
+            count = min(batch_size, iterations - start)
+            # String seeds are hashed the same way in every process
+            batch_seed = f"{seed}:{engine_name}:{batch}"
+            tasks.append((engine_name, reference_spec, engine_spec, chars,
+                          batch_seed, count, max_length, max_failures))
+
+    summary = {name: {"cases": 0, "chars": 0, "reference_time": 0.0, "engine_time": 0.0,
+                      "timed": reference_spec != "identity", "mismatches": 0, "failures": []}
+               for name, (reference_spec, _, _) in engines.items()}
+    with Pool(workers) as pool:
+        for engine_name, count, chars, timings, mismatches, failures in pool.imap_unordered(run_batch, tasks):
+            stats = summary[engine_name]
+            stats["cases"] += count
+            stats["chars"] += chars
+            stats["reference_time"] += timings["reference"]
+            stats["engine_time"] += timings["engine"]
+            stats["mismatches"] += mismatches
+            stats["failures"].extend(failures[:max_failures - len(stats["failures"])])
+    return summary
+
+def print_summary(summary):
+
+    # Print mismatches with reproducers and the throughput of each engine
+    for engine_name, stats in summary.items():
+        print(f"\n{engine_name}")
+        print("-" * 50)
+        if not stats["timed"]:
+            # The identity reference does no work, so throughput would mean nothing
+            print("Correctness only (round trip against the original text)")
+        else:
+            for label in ("reference", "engine"):
+                seconds = stats[f"{label}_time"] or 1e-9
+                print(f"{label.capitalize():<10} {stats['cases'] / seconds:>12,.0f} calls/s "
+                      f"{stats['chars'] / seconds / 1e6:>8.2f} M chars/s")
+        print(f"Mismatches: {stats['mismatches']} of {stats['cases']}")
+        for args, expected, actual in stats["failures"]:
+            print(f"  Reproducer: {args!r}")
+            print(f"    reference -> {expected!r}")
+            print(f"    engine    -> {actual!r}")
+
+def main():
+
+    print("DIFFERENTIAL FUZZ HARNESS ")
+
+    parser = argparse.ArgumentParser(description="Compare cipher engines against the reference functions")
+    parser.add_argument("--iterations", type=int, default=100000, help="random cases per engine")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument("--max-length", type=int, default=200, help="longest random text")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", action="append", default=[], metavar="REFERENCE=MODULE:FUNCTION",
+                        help="check an engine against a reference, e.g. caesar_encrypt=fast_caesar:encrypt")
+    args = parser.parse_args()
+
+    engines = dict(ENGINES)
+    for option in args.engine:
+        reference_name, _, engine_spec = option.partition("=")
+        if reference_name not in REFERENCES:
+            parser.error(f"Unknown reference {reference_name}; choose from {', '.join(REFERENCES)}")
+        engines[f"{reference_name} vs {engine_spec}"] = (REFERENCES[reference_name], engine_spec, TEXT_CHARS)
+
+    summary = fuzz(engines, args.iterations, args.workers, max_length=args.max_length, seed=args.seed)
+    print_summary(summary)
+
+    if any(stats["mismatches"] for stats in summary.values()):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
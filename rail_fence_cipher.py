@@ -79,33 +79,86 @@ def rail_fence_decrypt(ciphertext, num_rails):
     
     return plaintext
 
-def visualize_fence(text, num_rails):
+def rail_of(col, num_rails):
+
+    # Rail of a column in the zigzag, which repeats every 2 * (num_rails - 1) columns
+    cycle = 2 * (num_rails - 1)
+    pos = col % cycle
+    return pos if pos < num_rails else cycle - pos
+
+def rail_positions_before(rail, col, num_rails):
+
+    # Number of columns before col that fall on the given rail
+    cycle = 2 * (num_rails - 1)
+    full_cycles, remainder = divmod(col, cycle)
+    if rail == 0 or rail == num_rails - 1:
+        return full_cycles + (1 if rail < remainder else 0)
+    return 2 * full_cycles + (1 if rail < remainder else 0) + (1 if cycle - rail < remainder else 0)
+
+def fence_segment(text, num_rails, rail, start, stop, operation="encrypt"):
+
+    # One rail of the fence for columns start..stop-1, laid out for either operation
+    cycle = 2 * (num_rails - 1)
+    segment = [' '] * (stop - start)
+
+    if operation == "decrypt":
+        # The ciphertext holds each rail in turn, so find where this rail begins
+        rail_start = sum(rail_positions_before(r, len(text), num_rails) for r in range(rail))
+        char_index = rail_start + rail_positions_before(rail, start, num_rails)
+
+    # Columns on this rail are rail + k * cycle, plus cycle - rail + k * cycle for middle rails
+    offsets = [rail] if rail in (0, num_rails - 1) else [rail, cycle - rail]
+    first = start - start % cycle
+    for base in range(first, stop, cycle):
+        for offset in offsets:
+            col = base + offset
+            if start <= col < stop:
+                if operation == "decrypt":
+                    segment[col - start] = text[char_index]
+                    char_index += 1
+                else:
+                    segment[col - start] = text[col]
+
+    return ''.join(segment)
+
+def iter_fence_lines(text, num_rails, operation="encrypt", start=0, stop=None):
+
+    # Yield one rail at a time, limited to columns start..stop-1
+    if stop is None or stop > len(text):
+        stop = len(text)
+    start = max(0, min(start, stop))
+
+    if num_rails <= 1:
+        yield text[start:stop]
+        return
+
+    for rail in range(num_rails):
+        yield fence_segment(text, num_rails, rail, start, stop, operation)
+
+def write_fence(file, text, num_rails, operation="encrypt", start=0, stop=None, chunk_size=65536):
+
+    # Write the fence to a file object, rendering each rail in chunks of columns
+    if stop is None or stop > len(text):
+        stop = len(text)
+    start = max(0, min(start, stop))
+
+    if num_rails <= 1:
+        file.write(text[start:stop] + '\n')
+        return
+
+    for rail in range(num_rails):
+        for chunk_start in range(start, stop, chunk_size):
+            chunk_stop = min(chunk_start + chunk_size, stop)
+            file.write(fence_segment(text, num_rails, rail, chunk_start, chunk_stop, operation))
+        file.write('\n')
+
+def visualize_fence(text, num_rails, operation="encrypt"):
    
     if num_rails <= 1:
         return text
     
-    # Create visualization grid
-    fence = [[' ' for _ in range(len(text))] for _ in range(num_rails)]
-    
-    current_rail = 0
-    direction = 1
-    
-    for i, char in enumerate(text):
-        fence[current_rail][i] = char
-        
-        if current_rail == 0:
-            direction = 1
-        elif current_rail == num_rails - 1:
-            direction = -1
-        
-        current_rail += direction
-    
-    # Create visual representation
-    visualization = ""
-    for rail in fence:
-        visualization += ''.join(rail) + '\n'
-    
-    return visualization.rstrip()
+    # Create visual representation one rail at a time
+    return '\n'.join(iter_fence_lines(text, num_rails, operation)).rstrip()
 
 def main():
   
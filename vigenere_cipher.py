@@ -1,3 +1,14 @@
+import mmap
+import os
+from collections import deque
+from itertools import cycle
+
+# Running key letters are the ASCII letters of the key text, whatever its type;
+# translating bytes maps them to 0-25 and drops everything else
+_KEY_LETTERS = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+_KEY_TABLE = bytes.maketrans(_KEY_LETTERS, bytes(range(26)) * 2)
+_NON_KEY_BYTES = bytes(b for b in range(256) if b not in _KEY_LETTERS)
+
 def prepare_key(text, key):
     
     # Remove non-alphabetic characters from text for key length calculation
@@ -71,6 +82,196 @@ def vigenere_decrypt(ciphertext, key):
     
     return plaintext
 
+def letter_values(text):
+
+    # Letter values 0-25 in the same way encryption reads them, non-letters skipped
+    return bytes((ord(char) - (65 if char.isupper() else 97)) % 26 for char in text if char.isalpha())
+
+def shortest_period(values):
+
+    # Prefix function (as in Knuth-Morris-Pratt): prefix[i] is the length of the
+    # longest proper prefix of values[:i + 1] that is also its suffix
+    prefix = [0] * len(values)
+    for i in range(1, len(values)):
+        k = prefix[i - 1]
+        while k > 0 and values[i] != values[k]:
+            k = prefix[k - 1]
+        if values[i] == values[k]:
+            k += 1
+        prefix[i] = k
+
+    return len(values) - prefix[-1] if values else 0
+
+def recover_key(plaintext, ciphertext):
+
+    plain_values = letter_values(plaintext)
+    cipher_values = letter_values(ciphertext)
+    if len(plain_values) != len(cipher_values):
+        raise ValueError("Plaintext and ciphertext must contain the same number of letters")
+    if not plain_values:
+        raise ValueError("Plaintext must contain at least one letter")
+
+    # Subtracting plaintext from ciphertext leaves the repeating key shifts
+    shifts = bytes((c - p) % 26 for c, p in zip(cipher_values, plain_values))
+    period = shortest_period(shifts)
+    return ''.join(chr(shift + 65) for shift in shifts[:period])
+
+def crib_search(crib, ciphertext, max_period=None):
+
+    crib_values = letter_values(crib)
+    cipher_values = letter_values(ciphertext)
+    # A period is only checked when every key letter repeats within the crib, so keys
+    # longer than half the crib cannot be found and asking for them is an error
+    if max_period is None:
+        max_period = len(crib_values) // 2
+    if len(crib_values) < 2 * max(max_period, 1):
+        raise ValueError(f"A crib of {len(crib_values)} letters can only check key periods up to {len(crib_values) // 2}")
+
+    # Character position in ciphertext of every letter
+    positions = [i for i, char in enumerate(ciphertext) if char.isalpha()]
+
+    # The crib fits at offset j with period p when c[j+i] - crib[i] == c[j+i+p] - crib[i+p],
+    # i.e. when the crib differences at lag p occur in the ciphertext differences at lag p,
+    # so each period is one substring search over the whole ciphertext: O(n * max_period)
+    matches = {}
+    for period in range(1, max_period + 1):
+        pattern = bytes((a - b) % 26 for a, b in zip(crib_values, crib_values[period:]))
+        text = bytes((a - b) % 26 for a, b in zip(cipher_values, cipher_values[period:]))
+
+        offset = text.find(pattern)
+        while offset != -1:
+            if offset + len(crib_values) <= len(cipher_values):
+                matches.setdefault(offset, period)
+            offset = text.find(pattern, offset + 1)
+
+    results = []
+    for offset in sorted(matches):
+        period = matches[offset]
+        # Rotate the key so that it lines up with the start of the ciphertext
+        key = [''] * period
+        for i in range(period):
+            key[(offset + i) % period] = chr((cipher_values[offset + i] - crib_values[i]) % 26 + 65)
+        results.append((positions[offset], ''.join(key)))
+
+    return results
+
+def _transform_stream(chunks, shifts, decrypt=False, feedback=None):
+
+    # Shift every letter of each chunk by the next value from shifts; str chunks give
+    # str output and bytes chunks give bytes output with only ASCII letters shifted
+    for chunk in chunks:
+        is_bytes = not isinstance(chunk, str)
+        text = bytes(chunk).decode('latin-1') if is_bytes else chunk
+        result = []
+
+        for char in text:
+            if char.isalpha() and (char.isascii() or not is_bytes):
+                # Determine if character is uppercase or lowercase
+                ascii_offset = 65 if char.isupper() else 97
+                value = (ord(char) - ascii_offset) % 26
+
+                try:
+                    shift = next(shifts)
+                except StopIteration:
+                    raise ValueError("Key is shorter than the text") from None
+
+                if decrypt:
+                    value = (value - shift) % 26
+                result.append(chr((value + (0 if decrypt else shift)) % 26 + ascii_offset))
+
+                # Autokey: the recovered plaintext letter becomes a later key letter
+                if feedback is not None:
+                    feedback.append(value)
+            else:
+                # Non-alphabetic characters remain unchanged
+                result.append(char)
+
+        result = ''.join(result)
+        yield result.encode('latin-1') if is_bytes else result
+
+def _check_key(key):
+
+    if not key or not key.isalpha():
+        raise ValueError("Key must contain only alphabetic characters")
+    return letter_values(key.upper())
+
+def vigenere_encrypt_stream(chunks, key):
+
+    # Repeating key applied across chunks without building an extended key
+    return _transform_stream(chunks, cycle(_check_key(key)))
+
+def vigenere_decrypt_stream(chunks, key):
+
+    return _transform_stream(chunks, cycle(_check_key(key)), decrypt=True)
+
+def _autokey_shifts(pending):
+
+    # Each shift is consumed once and one plaintext letter is fed back per shift,
+    # so the queue never holds more than len(key) values
+    while pending:
+        yield pending.popleft()
+
+def autokey_encrypt_stream(chunks, key):
+
+    pending = deque(_check_key(key))
+    return _transform_stream(chunks, _autokey_shifts(pending), feedback=pending)
+
+def autokey_decrypt_stream(chunks, key):
+
+    pending = deque(_check_key(key))
+    return _transform_stream(chunks, _autokey_shifts(pending), decrypt=True, feedback=pending)
+
+def autokey_encrypt(plaintext, key):
+
+    return _join_like(plaintext, autokey_encrypt_stream([plaintext], key))
+
+def autokey_decrypt(ciphertext, key):
+
+    return _join_like(ciphertext, autokey_decrypt_stream([ciphertext], key))
+
+def running_key_shifts(key_text, chunk_size=1 << 16):
+
+    # Key letters from a str, bytes, mmap or open file, one chunk at a time. Anything
+    # with a length is sliced by index, so the same mmap can be used again; a file
+    # object is read from its current position and is used up
+    if hasattr(key_text, '__len__'):
+        chunks = (key_text[i:i + chunk_size] for i in range(0, len(key_text), chunk_size))
+    else:
+        chunks = iter(lambda: key_text.read(chunk_size), key_text.read(0))
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii', 'ignore')
+        yield from bytes(chunk).translate(_KEY_TABLE, _NON_KEY_BYTES)
+
+def open_running_key(path):
+
+    # Memory-map the key text so that only the pages in use are read
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+def running_key_encrypt_stream(chunks, key_text):
+
+    return _transform_stream(chunks, running_key_shifts(key_text))
+
+def running_key_decrypt_stream(chunks, key_text):
+
+    return _transform_stream(chunks, running_key_shifts(key_text), decrypt=True)
+
+def running_key_encrypt(plaintext, key_text):
+
+    return _join_like(plaintext, running_key_encrypt_stream([plaintext], key_text))
+
+def running_key_decrypt(ciphertext, key_text):
+
+    return _join_like(ciphertext, running_key_decrypt_stream([ciphertext], key_text))
+
+def _join_like(text, chunks):
+
+    return (b'' if not isinstance(text, str) else '').join(chunks)
+
 def main():
     
     